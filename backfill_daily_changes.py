@@ -2,6 +2,16 @@ import csv
 import os
 from datetime import datetime
 
+# Symbols tracked in the history file
+SYMBOLS = ['GEVO', 'FEIM', 'ARQ', 'UPXI']
+
+# Per-symbol column names, formatted once instead of once per row
+SYMBOL_COLS = [
+    (sym, f'{sym}_close', f'{sym}_qty', f'{sym}_price_change',
+     f'{sym}_price_change_pct', f'{sym}_value_change')
+    for sym in SYMBOLS
+]
+
 def backfill_daily_changes():
     """
     Backfill daily changes for existing portfolio history data
@@ -27,9 +37,6 @@ def backfill_daily_changes():
     shutil.copy2(csv_path, backup_path)
     print(f"Backup created: {backup_path}")
     
-    # Define symbols
-    symbols = ['GEVO', 'FEIM', 'ARQ', 'UPXI']
-    
     # Process each row and calculate changes
     enhanced_rows = []
     
@@ -38,10 +45,10 @@ def backfill_daily_changes():
         
         if i == 0:
             # First row - no previous data, set changes to 0
-            for sym in symbols:
-                enhanced_row[f'{sym}_price_change'] = '0.0000'
-                enhanced_row[f'{sym}_price_change_pct'] = '0.00'
-                enhanced_row[f'{sym}_value_change'] = '0.00'
+            for sym, close_col, qty_col, chg_col, pct_col, val_col in SYMBOL_COLS:
+                enhanced_row[chg_col] = '0.0000'
+                enhanced_row[pct_col] = '0.00'
+                enhanced_row[val_col] = '0.00'
             enhanced_row['portfolio_change'] = '0.00'
             enhanced_row['portfolio_change_pct'] = '0.00'
         else:
@@ -49,12 +56,12 @@ def backfill_daily_changes():
             prev_row = rows[i-1]
             
             # Individual stock changes
-            for sym in symbols:
+            for sym, close_col, qty_col, chg_col, pct_col, val_col in SYMBOL_COLS:
                 try:
-                    current_price = float(row[f'{sym}_close']) if row[f'{sym}_close'] else 0
-                    prev_price = float(prev_row[f'{sym}_close']) if prev_row[f'{sym}_close'] else 0
-                    quantity = int(row[f'{sym}_qty']) if row[f'{sym}_qty'] else 0
-                    
+                    current_price = float(row[close_col]) if row[close_col] else 0
+                    prev_price = float(prev_row[close_col]) if prev_row[close_col] else 0
+                    quantity = int(row[qty_col]) if row[qty_col] else 0
+
                     if prev_price > 0:
                         price_change = current_price - prev_price
                         price_change_pct = (price_change / prev_price) * 100
@@ -63,15 +70,15 @@ def backfill_daily_changes():
                         price_change = 0
                         price_change_pct = 0
                         value_change = 0
-                    
-                    enhanced_row[f'{sym}_price_change'] = f'{price_change:.4f}'
-                    enhanced_row[f'{sym}_price_change_pct'] = f'{price_change_pct:.2f}'
-                    enhanced_row[f'{sym}_value_change'] = f'{value_change:.2f}'
-                    
+
+                    enhanced_row[chg_col] = f'{price_change:.4f}'
+                    enhanced_row[pct_col] = f'{price_change_pct:.2f}'
+                    enhanced_row[val_col] = f'{value_change:.2f}'
+
                 except (ValueError, KeyError):
-                    enhanced_row[f'{sym}_price_change'] = '0.0000'
-                    enhanced_row[f'{sym}_price_change_pct'] = '0.00'
-                    enhanced_row[f'{sym}_value_change'] = '0.00'
+                    enhanced_row[chg_col] = '0.0000'
+                    enhanced_row[pct_col] = '0.00'
+                    enhanced_row[val_col] = '0.00'
             
             # Portfolio changes
             try:
@@ -94,26 +101,27 @@ def backfill_daily_changes():
     new_header = list(rows[0].keys()) if rows else []
     
     # Add new columns if they don't exist
-    for sym in symbols:
-        if f'{sym}_price_change' not in new_header:
-            new_header.append(f'{sym}_price_change')
-    for sym in symbols:
-        if f'{sym}_price_change_pct' not in new_header:
-            new_header.append(f'{sym}_price_change_pct')
-    for sym in symbols:
-        if f'{sym}_value_change' not in new_header:
-            new_header.append(f'{sym}_value_change')
+    for cols in SYMBOL_COLS:
+        if cols[3] not in new_header:
+            new_header.append(cols[3])
+    for cols in SYMBOL_COLS:
+        if cols[4] not in new_header:
+            new_header.append(cols[4])
+    for cols in SYMBOL_COLS:
+        if cols[5] not in new_header:
+            new_header.append(cols[5])
     
     if 'portfolio_change' not in new_header:
         new_header.append('portfolio_change')
     if 'portfolio_change_pct' not in new_header:
         new_header.append('portfolio_change_pct')
     
-    # Write the enhanced CSV
+    # Write the enhanced CSV; plain writer with a fixed column order skips
+    # DictWriter's per-row field lookup and tolerates stray extra keys
     with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=new_header)
-        writer.writeheader()
-        writer.writerows(enhanced_rows)
+        writer = csv.writer(f)
+        writer.writerow(new_header)
+        writer.writerows([row.get(col, '') for col in new_header] for row in enhanced_rows)
     
     print(f"✅ Successfully backfilled {len(enhanced_rows)} rows with daily changes")
     print(f"📊 Added columns: price_change, price_change_pct, value_change for each stock")
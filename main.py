@@ -2,62 +2,268 @@
 
 import os
 import json
+import asyncio
+import hashlib
+import time
 import requests
 import csv
-from datetime import datetime
-import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+import numpy as np
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tracked symbols; fixed order doubles as the index into the NumPy arrays below
+SYMBOLS = ["GEVO", "FEIM", "ARQ", "UPXI", "SERV", "MYOMO", "CABA"]
+SYMBOL_IDX = {s: i for i, s in enumerate(SYMBOLS)}
+
+@dataclass(slots=True)
+class Snapshot:
+    """One run's portfolio state, serialized to docs/latest.json."""
+    date: str
+    cash: str
+    total_value: str
+    prices: dict
+    quantities: dict
+    values: dict
+    actions: str
+    daily_changes: dict
+    claude_decisions_executed: bool
+
+# Fallback prices in case API fails
+FALLBACK_PRICES = {
+    'MYOMO': 1.18,
+    'CABA': 1.62,
+    'GEVO': 1.73,
+    'FEIM': 29.01,
+    'ARQ': 7.39,
+    'UPXI': 7.93,
+    'SERV': 9.71
+}
 
 def save_json(path, data):
-    if os.path.dirname(path):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        # orjson serializes straight to bytes, no intermediate str
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
 
 def load_json(path, default=None):
     if default is None:
         default = {}
     try:
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(path, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
         return default
 
-def get_stock_price(symbol, api_key):
-    # Fallback prices in case API fails
-    fallback_prices = {
-        'MYOMO': 1.18,
-        'CABA': 1.62,
-        'GEVO': 1.73,
-        'FEIM': 29.01,
-        'ARQ': 7.39,
-        'UPXI': 7.93,
-        'SERV': 9.71
-    }
-    
+# Quote cache: warm reruns (e.g. market closed, quick re-invocations) skip the API
+CACHE_DIR = "cache/alpha_vantage"
+CACHE_TTL = int(os.environ.get("AV_CACHE_TTL", 900))
+
+def _cache_path(symbol, api_key):
+    key = hashlib.md5(f"{symbol}{api_key}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def get_cached_price(symbol, api_key):
+    """Return the cached price for a symbol, or None if missing/expired."""
+    path = _cache_path(symbol, api_key)
+    try:
+        if time.time() - os.path.getmtime(path) < CACHE_TTL:
+            return load_json(path).get("price")
+    except (OSError, ValueError):
+        pass
+    return None
+
+def cache_price(symbol, api_key, price):
+    try:
+        save_json(_cache_path(symbol, api_key), {"symbol": symbol, "price": price})
+    except OSError as e:
+        print(f"Warning: could not cache price for {symbol}: {e}")
+
+def get_stock_price(symbol, api_key, session=None):
+    fallback_prices = FALLBACK_PRICES
+
+    # Reuse a shared session (connection pooling) when one is provided
+    http = session if session is not None else requests
+
     try:
         url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={api_key}"
-        response = requests.get(url, timeout=30)
-        data = response.json()
-        
+        response = http.get(url, timeout=30)
+        data = parse_response(response)
+
         if 'Global Quote' in data and '05. price' in data['Global Quote']:
             return float(data['Global Quote']['05. price'])
         elif 'Global Quote' in data and data['Global Quote'] == {}:
             # Try alternative ticker for MYOMO
             if symbol == 'MYOMO':
                 url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol=MYO&apikey={api_key}"
-                response = requests.get(url, timeout=30)
-                data = response.json()
+                response = http.get(url, timeout=30)
+                data = parse_response(response)
                 if 'Global Quote' in data and '05. price' in data['Global Quote']:
                     return float(data['Global Quote']['05. price'])
-        
+
         print(f"API failed for {symbol}, using fallback price: ${fallback_prices.get(symbol, 0)}")
         return fallback_prices.get(symbol, 0)
-        
+
     except Exception as e:
         print(f"Error fetching {symbol}: {e}, using fallback: ${fallback_prices.get(symbol, 0)}")
         return fallback_prices.get(symbol, 0)
 
-def execute_trading_decisions(holdings, prices, date, cash):
+def parse_response(response):
+    """Decode a quote response body; orjson parses the raw bytes directly."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def get_bulk_quotes(symbols, api_key):
+    """Fetch all symbols in one REALTIME_BULK_QUOTES call; None if unavailable."""
+    try:
+        url = "https://www.alphavantage.co/query"
+        params = {"function": "REALTIME_BULK_QUOTES", "symbol": ",".join(symbols), "apikey": api_key}
+        response = requests.get(url, params=params, timeout=30)
+        data = parse_response(response)
+
+        quotes = data.get("data")
+        if not quotes:
+            # Plans without bulk access return a message/Information payload instead
+            return None
+
+        prices = {}
+        for quote in quotes:
+            symbol = quote.get("symbol")
+            price = quote.get("close") or quote.get("price")
+            if symbol and price:
+                try:
+                    prices[symbol] = float(price)
+                except (TypeError, ValueError):
+                    pass
+        return prices or None
+
+    except Exception as e:
+        print(f"Bulk quote fetch failed: {e}")
+        return None
+
+async def fetch_price_async(client, symbol, api_key):
+    try:
+        url = "https://www.alphavantage.co/query"
+        params = {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": api_key}
+        response = await client.get(url, params=params)
+        data = parse_response(response)
+
+        if 'Global Quote' in data and '05. price' in data['Global Quote']:
+            return float(data['Global Quote']['05. price'])
+        elif 'Global Quote' in data and data['Global Quote'] == {}:
+            # Try alternative ticker for MYOMO
+            if symbol == 'MYOMO':
+                params["symbol"] = "MYO"
+                response = await client.get(url, params=params)
+                data = parse_response(response)
+                if 'Global Quote' in data and '05. price' in data['Global Quote']:
+                    return float(data['Global Quote']['05. price'])
+
+    except Exception as e:
+        print(f"Error fetching {symbol}: {e}")
+
+    return None
+
+async def _gather_prices(symbols, api_key):
+    # One HTTP/2 connection multiplexes all quote requests
+    async with httpx.AsyncClient(http2=True, timeout=10) as client:
+        return await asyncio.gather(*(fetch_price_async(client, s, api_key) for s in symbols))
+
+def fetch_all_prices(symbols, api_key):
+    """Fetch all symbols at once; async HTTP/2 when httpx is available, threads otherwise."""
+    prices = {}
+
+    # Serve fresh cache entries first so warm reruns hit the network zero times
+    to_fetch = []
+    for symbol in symbols:
+        cached = get_cached_price(symbol, api_key)
+        if cached:
+            prices[symbol] = cached
+            print(f"Using cached price for {symbol}: ${cached:.4f}")
+        else:
+            to_fetch.append(symbol)
+
+    if not to_fetch:
+        return prices
+
+    results = None
+
+    # One bulk round-trip covers every symbol when the API plan supports it
+    bulk = get_bulk_quotes(to_fetch, api_key)
+    if bulk is not None:
+        results = [bulk.get(s) for s in to_fetch]
+
+    if results is None and httpx is not None:
+        try:
+            results = asyncio.run(_gather_prices(to_fetch, api_key))
+        except Exception as e:
+            print(f"Async fetch failed: {e}, falling back to threaded fetch")
+
+    if results is None:
+        with requests.Session() as session:
+            with ThreadPoolExecutor(max_workers=len(to_fetch)) as executor:
+                results = list(executor.map(lambda s: get_stock_price(s, api_key, session), to_fetch))
+
+    for symbol, price in zip(to_fetch, results):
+        if price is None:
+            print(f"API failed for {symbol}, using fallback price: ${FALLBACK_PRICES.get(symbol, 0)}")
+            price = FALLBACK_PRICES.get(symbol, 0)
+        elif price != FALLBACK_PRICES.get(symbol):
+            # Only cache real quotes, never the hardcoded fallbacks
+            cache_price(symbol, api_key, price)
+        if price:
+            prices[symbol] = price
+    return prices
+
+def get_previous_day_data(history_file="data/portfolio_history.csv"):
+    """Read the last portfolio history row without parsing the whole file."""
+    try:
+        with open(history_file, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            # Only the final row is kept; earlier rows are discarded as read
+            last_rows = deque(reader, maxlen=1)
+    except (OSError, StopIteration):
+        return {}
+
+    if not last_rows:
+        return {}
+
+    row = dict(zip(header, last_rows[0]))
+
+    prices = {}
+    for col, value in row.items():
+        if col.endswith("_close") and value:
+            try:
+                prices[col[:-len("_close")]] = float(value)
+            except ValueError:
+                pass
+
+    return {
+        "date": row.get("date"),
+        "total_value": row.get("total_value"),
+        "prices": prices
+    }
+
+def execute_trading_decisions(holdings, prices, current_date, cash):
     decisions_file = "trading_decisions.json"
     
     if not os.path.exists(decisions_file):
@@ -65,8 +271,7 @@ def execute_trading_decisions(holdings, prices, date, cash):
         return holdings, [], cash
     
     try:
-        with open(decisions_file, 'r') as f:
-            decisions_data = json.load(f)
+        decisions_data = load_json(decisions_file)
     except Exception as e:
         print(f"Error loading trading decisions: {e}")
         return holdings, [], cash
@@ -74,7 +279,12 @@ def execute_trading_decisions(holdings, prices, date, cash):
     if "execution_queue" not in decisions_data:
         print("No execution_queue found in trading decisions")
         return holdings, [], cash
-    
+
+    if not decisions_data["execution_queue"]:
+        # Nothing queued: skip the clear-and-rewrite so the file is untouched
+        print("No pending trades in execution queue")
+        return holdings, [], cash
+
     executed_actions = []
     
     for trade in decisions_data["execution_queue"]:
@@ -164,7 +374,11 @@ def main():
         return 1
     
     print(f"✅ Using API key: {api_key[:10]}...")
-    
+
+    # Bootstrap output directories once; save_json no longer re-checks per write
+    for directory in ("data", "docs", CACHE_DIR):
+        os.makedirs(directory, exist_ok=True)
+
     # Initialize or load existing portfolio
     holdings = load_json("data/holdings.json", {
         "GEVO": 0, "FEIM": 0, "ARQ": 37, "UPXI": 17, "SERV": 26, "MYOMO": 209, "CABA": 112
@@ -176,49 +390,46 @@ def main():
     print(f"✅ Loaded holdings: {holdings}")
     print(f"✅ Loaded cash: ${cash:.2f}")
     
-    # Define all symbols
-    symbols = ["GEVO", "FEIM", "ARQ", "UPXI", "SERV", "MYOMO", "CABA"]
-    
-    # Fetch current prices
+    # Fetch current prices concurrently (I/O-bound, single connection)
     print(f"📈 Fetching current stock prices...")
-    prices = {}
-    for symbol in symbols:
-        print(f"Fetching {symbol}...")
-        price = get_stock_price(symbol, api_key)
-        if price:
-            prices[symbol] = price
-            print(f"Fetched {symbol}: ${price:.4f}")
-        else:
-            print(f"Failed to fetch {symbol}")
+    prices = fetch_all_prices(SYMBOLS, api_key)
+
+    for symbol, price in prices.items():
+        print(f"Fetched {symbol}: ${price:.4f}")
+    for symbol in set(SYMBOLS) - prices.keys():
+        print(f"Failed to fetch {symbol}")
     
     if not prices:
         print("Error: No prices fetched successfully")
         return 1
     
-    # Get current date
-    current_date = datetime.now().strftime('%Y-%m-%d')
-    
+    # Get current date once; date.today() skips the time formatting entirely
+    current_date = date.today().isoformat()
+
     # Execute trading decisions
     print(f"🔄 Processing trading decisions...")
     print(f"🤖 Checking Claude's trading decisions...")
     holdings, claude_actions, cash = execute_trading_decisions(holdings, prices, current_date, cash)
     
-    # Calculate portfolio values
+    # Calculate portfolio values (struct-of-arrays: one vector per field)
     print(f"💰 Calculating portfolio values...")
+    qty_arr = np.array([holdings.get(s, 0) for s in SYMBOLS], dtype=np.float64)
+    price_arr = np.array([prices.get(s, 0) for s in SYMBOLS], dtype=np.float64)
+    value_arr = qty_arr * price_arr
+    total_value = cash + value_arr.sum()
+
+    # Per-symbol dicts and report lines are built in one pass at the output boundary
     values = {}
     quantities = {}
-    total_value = cash
-    
-    for symbol in symbols:
-        qty = holdings.get(symbol, 0)
-        price = prices.get(symbol, 0)
-        value = qty * price
-        
-        if qty > 0:  # Only include positions actually held
+    position_lines = []
+
+    for symbol, i in SYMBOL_IDX.items():
+        if qty_arr[i] > 0:  # Only include positions actually held
+            qty = holdings.get(symbol, 0)
             quantities[symbol] = qty
-            values[symbol] = f"{value:.2f}"
-            total_value += value
-            print(f"Holdings after trading: {symbol}: {qty} shares @ ${price:.4f} = ${value:.2f}")
+            values[symbol] = f"{value_arr[i]:.2f}"
+            position_lines.append(f"- {symbol}: close {price_arr[i]:.4f}, qty {qty}, value ${value_arr[i]:.2f}")
+            print(f"Holdings after trading: {symbol}: {qty} shares @ ${price_arr[i]:.4f} = ${value_arr[i]:.2f}")
     
     print(f"Cash after trading: ${cash:.2f}")
     print(f"💼 Total portfolio value: ${total_value:.2f}")
@@ -229,6 +440,8 @@ def main():
     
     try:
         previous_data = load_json("docs/latest.json")
+        if not previous_data.get("total_value"):
+            previous_data = get_previous_day_data()
         if previous_data.get("total_value"):
             prev_total = float(previous_data["total_value"])
             total_change = total_value - prev_total
@@ -239,18 +452,22 @@ def main():
             }
             print(f"Daily portfolio change: ${total_change:.2f} ({total_change_pct:.2f}%)")
         
-        # Calculate individual stock changes
+        # Calculate individual stock changes in one vectorized pass
+        prev_prices = previous_data.get("prices", {})
+        prev_arr = np.array([prev_prices.get(s, prices.get(s, 0)) for s in SYMBOLS], dtype=np.float64)
+        change_arr = price_arr - prev_arr
+        # Masked divide: zero-price entries are simply never touched, no branches
+        change_pct_arr = np.zeros_like(prev_arr)
+        np.divide(change_arr, prev_arr, out=change_pct_arr, where=prev_arr > 0)
+        change_pct_arr *= 100
+        value_change_arr = change_arr * qty_arr
+
         for symbol in quantities:
-            prev_price = previous_data.get("prices", {}).get(symbol, prices[symbol])
-            curr_price = prices[symbol]
-            price_change = curr_price - prev_price
-            price_change_pct = (price_change / prev_price) * 100 if prev_price > 0 else 0
-            value_change = quantities[symbol] * price_change
-            
+            i = SYMBOL_IDX[symbol]
             daily_changes["individual"][symbol] = {
-                "price_change": price_change,
-                "price_change_pct": price_change_pct,
-                "value_change": value_change
+                "price_change": float(change_arr[i]),
+                "price_change_pct": float(change_pct_arr[i]),
+                "value_change": float(value_change_arr[i])
             }
             
     except Exception as e:
@@ -258,39 +475,32 @@ def main():
         print("Continuing without daily change calculation...")
     
     # Prepare data for JSON output
-    json_data = {
-        "date": current_date,
-        "cash": f"{cash:.2f}",
-        "total_value": f"{total_value:.2f}",
-        "prices": {symbol: prices[symbol] for symbol in symbols if symbol in prices},
-        "quantities": quantities,
-        "values": values,
-        "actions": "; ".join(claude_actions) if claude_actions else "No trades executed",
-        "daily_changes": daily_changes,
-        "claude_decisions_executed": len(claude_actions) > 0
-    }
-    
+    snapshot = Snapshot(
+        date=current_date,
+        cash=f"{cash:.2f}",
+        total_value=f"{total_value:.2f}",
+        # prices is keyed only by tracked symbols, so no per-key filter is needed
+        prices=dict(prices),
+        quantities=quantities,
+        values=values,
+        actions="; ".join(claude_actions) if claude_actions else "No trades executed",
+        daily_changes=daily_changes,
+        claude_decisions_executed=len(claude_actions) > 0
+    )
+
     # Save all data
-    os.makedirs("data", exist_ok=True)
-    os.makedirs("docs", exist_ok=True)
-    
     save_json("data/holdings.json", holdings)
     save_json("data/cash.json", {"cash": cash})
-    save_json("docs/latest.json", json_data)
+    save_json("docs/latest.json", asdict(snapshot))
     
-    # Create markdown report
+    # Create markdown report from the lines built in the valuation pass
     report_lines = [
         "# Portfolio Report",
         f"**As of (latest close)**: {current_date}",
         ""
     ]
-    
-    for symbol in quantities:
-        qty = quantities[symbol]
-        price = prices[symbol]
-        value = float(values[symbol])
-        report_lines.append(f"- {symbol}: close {price:.4f}, qty {qty}, value ${value:.2f}")
-    
+    report_lines.extend(position_lines)
+
     if cash > 0:
         report_lines.append(f"\nCash: ${cash:.2f}")
     
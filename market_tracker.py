@@ -4,14 +4,23 @@ import json
 import os
 from datetime import datetime, timezone
 
+# Tickers for market context
+MEGACAPS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'BRK-B']
+INDICES = ['SPY', 'QQQ', 'IWM', 'VTI']
+SECTORS = ['XLK', 'XLF', 'XLE', 'XLV', 'XLI']
+
+# History CSV columns, derived once from the ticker lists
+HISTORY_COLUMNS = ["date", "market_mood", "small_vs_large_cap"]
+for _ticker in MEGACAPS + INDICES + SECTORS:
+    HISTORY_COLUMNS.extend([f"{_ticker}_price", f"{_ticker}_change"])
+
 def fetch_market_data():
     """Fetch market context data using yfinance"""
-    
-    # Define tickers for market context
-    megacaps = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'BRK-B']
-    indices = ['SPY', 'QQQ', 'IWM', 'VTI']
-    sectors = ['XLK', 'XLF', 'XLE', 'XLV', 'XLI']
-    
+
+    megacaps = MEGACAPS
+    indices = INDICES
+    sectors = SECTORS
+
     all_tickers = megacaps + indices + sectors
     
     try:
@@ -141,28 +150,18 @@ def save_market_data(market_data):
         
         # Append to historical data
         history_file = "data/market_history.csv"
-        
-        # Create CSV header if file doesn't exist
-        if not os.path.exists(history_file):
-            with open(history_file, "w") as f:
-                headers = ["date", "market_mood", "small_vs_large_cap"]
-                
-                # Add megacap columns
-                for ticker in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'BRK-B']:
-                    headers.extend([f"{ticker}_price", f"{ticker}_change"])
-                
-                # Add index columns  
-                for ticker in ['SPY', 'QQQ', 'IWM', 'VTI']:
-                    headers.extend([f"{ticker}_price", f"{ticker}_change"])
-                
-                # Add sector columns
-                for ticker in ['XLK', 'XLF', 'XLE', 'XLV', 'XLI']:
-                    headers.extend([f"{ticker}_price", f"{ticker}_change"])
-                
-                f.write(",".join(headers) + "\n")
-        
-        # Append today's data
-        with open(history_file, "a") as f:
+
+        # Single stat to decide whether the header is needed (new or empty file)
+        try:
+            need_header = os.stat(history_file).st_size == 0
+        except OSError:
+            need_header = True
+
+        # One buffered append handles both header and today's row
+        with open(history_file, "a", buffering=64*1024) as f:
+            if need_header:
+                f.write(",".join(HISTORY_COLUMNS) + "\n")
+
             row = [
                 market_data["date"],
                 market_data["market_mood"],
@@ -170,7 +169,7 @@ def save_market_data(market_data):
             ]
             
             # Add megacap data
-            for ticker in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'BRK-B']:
+            for ticker in MEGACAPS:
                 if ticker in market_data["megacaps"]:
                     row.extend([
                         market_data["megacaps"][ticker]["price"],
@@ -180,7 +179,7 @@ def save_market_data(market_data):
                     row.extend([0, 0])
             
             # Add index data
-            for ticker in ['SPY', 'QQQ', 'IWM', 'VTI']:
+            for ticker in INDICES:
                 if ticker in market_data["indices"]:
                     row.extend([
                         market_data["indices"][ticker]["price"],
@@ -190,7 +189,7 @@ def save_market_data(market_data):
                     row.extend([0, 0])
             
             # Add sector data
-            for ticker in ['XLK', 'XLF', 'XLE', 'XLV', 'XLI']:
+            for ticker in SECTORS:
                 if ticker in market_data["sectors"]:
                     row.extend([
                         market_data["sectors"][ticker]["price"],
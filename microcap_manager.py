@@ -381,8 +381,8 @@ def main():
         print("📋 Portfolio initialized from experiment parameters")
     else:
         print("📋 Loading existing portfolio state...")
-        # Load latest state from CSV
-        df = pd.read_csv(PORTFOLIO_CSV)
+        # Load latest state from CSV; only the columns we rebuild state from
+        df = pd.read_csv(PORTFOLIO_CSV, usecols=["date", "ticker", "shares", "buy_price", "stop_loss"])
         latest_positions = df[(df["date"] == df["date"].max()) & (df["ticker"] != "TOTAL")]
         
         if not latest_positions.empty: